@@ -1,7 +1,13 @@
 #!/usr/bin/env python3
+import os
+import json
 import time
 import datetime
+import threading
+from functools import lru_cache
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from rgbmatrix import RGBMatrix, RGBMatrixOptions
 from PIL import Image, ImageDraw, ImageFont
 
@@ -16,6 +22,10 @@ options.gpio_slowdown = 3
 
 matrix = RGBMatrix(options=options)
 
+# Offscreen canvas for double-buffered, tear-free updates
+offscreen = matrix.CreateFrameCanvas()
+_last_frame = None
+
 # Fonts - using even smaller sizes
 try:
     font_large = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 10)
@@ -26,33 +36,120 @@ except IOError:
     font_medium = ImageFont.load_default()
     font_small = ImageFont.load_default()
 
+# Text width lookups - the same strings are measured over and over, so cache them
+_MEASURE_DRAW = ImageDraw.Draw(Image.new("RGB", (1, 1)))
+
+@lru_cache(maxsize=256)
+def text_width(text, font):
+    # Fonts hash by identity, so each font object gets its own cache entries
+    return _MEASURE_DRAW.textlength(text, font=font)
+
+# Static screen backgrounds (header bar + title) rendered once at startup
+def make_header_background(title, header_color):
+    background = Image.new("RGB", (64, 32))
+    draw = ImageDraw.Draw(background)
+    draw.rectangle((0, 0, 64, 9), fill=header_color)
+    title_width = text_width(title, font_medium)
+    draw.text(((64 - title_width) // 2, 1), title, font=font_medium, fill=(255, 255, 255))
+    return background
+
+WEATHER_BG = make_header_background("WEATHER", (0, 0, 128))  # Blue header
+F1_BG = make_header_background("F1", (128, 0, 0))  # Red header, shortened to just "F1"
+
+# Shared HTTP session so API calls reuse keep-alive connections
+SESSION = requests.Session()
+SESSION.headers.update({"User-Agent": "led-matrix-dashboard", "Accept": "application/json"})
+# Retry rate limits and server errors with exponential backoff. Ignore Retry-After so a
+# server can't stall the refresh thread for an arbitrary time.
+retry = Retry(total=3, backoff_factor=1.0, status_forcelist=(429, 500, 502, 503, 504),
+              allowed_methods=("GET",), respect_retry_after_header=False)
+adapter = HTTPAdapter(pool_connections=2, pool_maxsize=4, max_retries=retry)
+SESSION.mount("http://", adapter)
+SESSION.mount("https://", adapter)
+
 # Weather API (OpenWeatherMap)
 def get_weather():
     return "Weather feature needs API key"
 
+# F1 schedule cache - the season schedule rarely changes
+CACHE_PATH = "/tmp/f1_schedule.json"
+CACHE_TTL = 6 * 3600  # 6 hours
+
+def load_schedule_cache():
+    # Returns (cache dict, age in seconds) or (None, None) if there is no usable cache
+    try:
+        age = time.time() - os.stat(CACHE_PATH).st_mtime
+        with open(CACHE_PATH) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return None, None
+    if not isinstance(cache, dict) or "data" not in cache:
+        return None, None
+    return cache, age
+
+def save_schedule_cache(data, etag):
+    # Write to a temp file first so a crash never leaves a half-written cache
+    tmp_path = CACHE_PATH + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({"etag": etag, "data": data}, f)
+    os.replace(tmp_path, CACHE_PATH)
+
+def get_schedule():
+    schedule_url = "http://ergast.com/api/f1/current.json"
+    cache, age = load_schedule_cache()
+    if cache is not None and age < CACHE_TTL:
+        return cache["data"]
+    
+    headers = {}
+    if cache is not None and cache.get("etag"):
+        headers["If-None-Match"] = cache["etag"]
+    
+    try:
+        response = SESSION.get(schedule_url, headers=headers, timeout=(3, 5))  # (connect, read) seconds
+        if response.status_code == 304:
+            # Not modified - refresh the cache timestamp and reuse it
+            try:
+                os.utime(CACHE_PATH)
+            except OSError as e:
+                print(f"Warning: could not refresh F1 schedule cache: {e}")
+            return cache["data"]
+        response.raise_for_status()
+        data = response.json()
+    except requests.RequestException as e:
+        if cache is None:
+            raise
+        print(f"Warning: using stale F1 schedule cache: {e}")
+        return cache["data"]
+    
+    try:
+        save_schedule_cache(data, response.headers.get("ETag"))
+    except OSError as e:
+        print(f"Warning: could not write F1 schedule cache: {e}")
+    return data
+
 # F1 API (Ergast Developer API)
 def get_f1_data():
     try:
-        # Get current season schedule
-        schedule_url = "http://ergast.com/api/f1/current.json"
-        schedule_response = requests.get(schedule_url)
-        schedule_data = schedule_response.json()
+        # Get current season schedule (cached on disk)
+        schedule_data = get_schedule()
         
         # Find next race
         races = schedule_data["MRData"]["RaceTable"]["Races"]
         next_race = None
-        current_date = datetime.datetime.now()
+        next_race_date = None
+        current_date = datetime.date.today()
         
         for race in races:
             # Parse race date
-            race_date = datetime.datetime.strptime(race['date'], "%Y-%m-%d")
+            race_date = datetime.date.fromisoformat(race['date'])
             if race_date > current_date:
                 next_race = race
+                next_race_date = race_date
                 break
         
         if next_race:
             race_name = next_race["raceName"].split("Grand Prix")[0].strip()
-            date_str = datetime.datetime.strptime(next_race["date"], "%Y-%m-%d").strftime("%b %d")
+            date_str = next_race_date.strftime("%b %d")
             return {
                 "race_name": race_name,
                 "date": date_str,
@@ -65,34 +162,50 @@ def get_f1_data():
         print(f"Error getting F1 data: {e}")
         return None
 
-def draw_time_screen(image, draw):
-    # Draw the time and date screen
+# Last formatted clock strings, keyed by (hour, minute, day) so strftime runs once a minute
+_last_clock = (None, None)
+
+def get_time_content():
+    global _last_clock
     now = datetime.datetime.now()
-    time_str = now.strftime("%I:%M %p")
-    date_str = now.strftime("%A")
-    day_str = now.strftime("%B %d")
+    key = (now.hour, now.minute, now.day)
+    if key != _last_clock[0]:
+        _last_clock = (key, (now.strftime("%I:%M %p"), now.strftime("%A"), now.strftime("%B %d")))
+    return _last_clock[1]
+
+def get_weather_content():
+    with data_lock:
+        return weather_str[:30]
+
+def get_f1_content():
+    with data_lock:
+        data = f1_data
+    if isinstance(data, dict):
+        return (data["race_name"], data["date"], data["location"])
+    return None
+
+def draw_time_screen(image, draw, content):
+    # Draw the time and date screen
+    time_str, date_str, day_str = content
     
     # Center the time
-    time_width = draw.textlength(time_str, font=font_large)
+    time_width = text_width(time_str, font_large)
     draw.text(((64 - time_width) // 2, 4), time_str, font=font_large, fill=(255, 0, 0))
     
     # Draw the day of week
-    date_width = draw.textlength(date_str, font=font_medium)
+    date_width = text_width(date_str, font_medium)
     draw.text(((64 - date_width) // 2, 15), date_str, font=font_medium, fill=(0, 255, 0))
     
     # Draw the date
-    day_width = draw.textlength(day_str, font=font_small)
+    day_width = text_width(day_str, font_small)
     draw.text(((64 - day_width) // 2, 23), day_str, font=font_small, fill=(0, 255, 255))
 
-def draw_weather_screen(image, draw):
+def draw_weather_screen(image, draw, content):
     # Draw the weather screen - even more compact layout
-    draw.rectangle((0, 0, 64, 9), fill=(0, 0, 128))  # Blue header
-    
-    title_width = draw.textlength("WEATHER", font=font_medium)
-    draw.text(((64 - title_width) // 2, 1), "WEATHER", font=font_medium, fill=(255, 255, 255))
+    image.paste(WEATHER_BG)
     
     # Split weather info into multiple lines if needed
-    weather_text = weather_str[:30]
+    weather_text = content
     if len(weather_text) > 15:
         line1 = weather_text[:15]
         line2 = weather_text[15:]
@@ -101,67 +214,119 @@ def draw_weather_screen(image, draw):
     else:
         draw.text((2, 18), weather_text, font=font_small, fill=(255, 255, 255))
 
-def draw_f1_screen(image, draw):
+def draw_f1_screen(image, draw, content):
     # Draw the F1 screen - even more compact layout
-    draw.rectangle((0, 0, 64, 9), fill=(128, 0, 0))  # Red header
-    
-    title_width = draw.textlength("F1", font=font_medium)  # Shortened to just "F1"
-    draw.text(((64 - title_width) // 2, 1), "F1", font=font_medium, fill=(255, 255, 255))
+    image.paste(F1_BG)
     
-    if isinstance(f1_data, dict):
+    if content is not None:
+        race_name, race_date, location = content
+        
         # Display race name (shortened)
-        race_name = f1_data["race_name"][:15]
-        race_width = draw.textlength(race_name, font=font_small)
+        race_name = race_name[:15]
+        race_width = text_width(race_name, font_small)
         draw.text(((64 - race_width) // 2, 13), race_name, font=font_small, fill=(255, 165, 0))
         
         # Display date and location
-        date_loc = f"{f1_data['date']} - {f1_data['location'][:8]}"
-        date_width = draw.textlength(date_loc, font=font_small)
+        date_loc = f"{race_date} - {location[:8]}"
+        date_width = text_width(date_loc, font_small)
         draw.text(((64 - date_width) // 2, 22), date_loc, font=font_small, fill=(255, 255, 255))
     else:
         msg = "No races"  # Shortened message
-        msg_width = draw.textlength(msg, font=font_small)
+        msg_width = text_width(msg, font_small)
         draw.text(((64 - msg_width) // 2, 18), msg, font=font_small, fill=(255, 255, 255))
 
+# Rendered frames (raw RGB bytes) keyed by (screen id, content) so unchanged screens aren't redrawn.
+# Kept in least recently used order.
+_screen_cache = {}
+SCREEN_CACHE_SIZE = 8
+
+# Single image and draw object reused for every frame instead of allocating new ones
+IMAGE = Image.new("RGB", (options.cols, options.rows))
+DRAW = ImageDraw.Draw(IMAGE)
+
+SCREENS = {
+    "time": (get_time_content, draw_time_screen),
+    "weather": (get_weather_content, draw_weather_screen),
+    "f1": (get_f1_content, draw_f1_screen),
+}
+
 def draw_screen():
-    # Create a blank image
-    image = Image.new("RGB", (options.cols, options.rows))
-    draw = ImageDraw.Draw(image)
+    global offscreen, _last_frame
     
     # Determine which screen to show based on time
     seconds = int(time.time()) % 30  # Rotate every 30 seconds (10 sec per screen)
     
     if seconds < 10:
-        draw_time_screen(image, draw)
+        screen_id = "time"
     elif seconds < 20:
-        draw_weather_screen(image, draw)
+        screen_id = "weather"
     else:
-        draw_f1_screen(image, draw)
+        screen_id = "f1"
+    
+    get_content, draw_func = SCREENS[screen_id]
+    key = (screen_id, get_content())
+    
+    frame = _screen_cache.get(key)
+    if frame is None:
+        # Render the screen once and keep its pixels until its content changes
+        DRAW.rectangle((0, 0, options.cols, options.rows), fill=(0, 0, 0))
+        draw_func(IMAGE, DRAW, key[1])
+        frame = IMAGE.tobytes()
+        
+        _screen_cache[key] = frame
+        if len(_screen_cache) > SCREEN_CACHE_SIZE:
+            # Evict the least recently used entry
+            del _screen_cache[next(iter(_screen_cache))]
+    else:
+        # Move the hit to the end so stale entries (old clock minutes) are evicted first
+        _screen_cache[key] = _screen_cache.pop(key)
+        if frame != _last_frame:
+            # Load the cached pixels back into the shared image
+            IMAGE.frombytes(frame)
+    
+    # Only swap in a new frame when the pixels actually changed
+    if frame == _last_frame:
+        return
+    _last_frame = frame
     
     # Display on matrix
-    matrix.SetImage(image)
+    offscreen.SetImage(IMAGE)
+    offscreen = matrix.SwapOnVSync(offscreen)
 
-# Initialize data
-weather_str = get_weather()
-f1_data = get_f1_data()
+# Initialize data with placeholders - the refresh thread fills them in
+weather_str = "Loading..."
+f1_data = None
+data_lock = threading.Lock()
+data_updated = threading.Event()
 
-# Update data every 10 minutes
-last_update = 0
+def refresh_loop():
+    # Update data every 10 minutes in the background so network calls never block drawing
+    global weather_str, f1_data
+    while True:
+        new_weather = get_weather()
+        new_f1_data = get_f1_data()
+        with data_lock:
+            weather_str = new_weather
+            f1_data = new_f1_data
+        data_updated.set()
+        print("Data updated")
+        time.sleep(600)  # 600 seconds = 10 minutes
+
+threading.Thread(target=refresh_loop, daemon=True).start()
 
 # Main loop
 try:
     print("Press CTRL+C to stop")
     while True:
-        # Update data every 10 minutes
-        current_time = time.time()
-        if current_time - last_update > 600:  # 600 seconds = 10 minutes
-            weather_str = get_weather()
-            f1_data = get_f1_data()
-            last_update = current_time
-            print("Data updated")
-        
         draw_screen()
-        time.sleep(0.5)  # Update every half second
+        
+        # Sleep until the next 10 second boundary (which also covers every minute tick),
+        # or until new data arrives
+        now = time.time()
+        next_rotation = (int(now) // 10 + 1) * 10
+        sleep_time = next_rotation - now + 0.01  # Land just past the boundary
+        data_updated.wait(max(0.05, sleep_time))
+        data_updated.clear()
 except KeyboardInterrupt:
     print("Exiting...")
     matrix.Clear()